@@ -13,10 +13,24 @@ import math
 
 # Constants
 SQRT3 = math.sqrt(3)
+HEX_AREA_K = 1.5 * SQRT3  # Area of a hexagon = HEX_AREA_K * radius^2
 GENERATED_PREFIX = "hex#"
 TOLERANCE = 0.001  # Small tolerance for floating point comparisons
 MIN_AREA_RATIO = 0.03  # Minimum profile area as ratio of full hex (filters margin slivers)
 MAX_AREA_RATIO = 1.1  # Maximum profile area as ratio of full hex (filters outer face)
+PLANE_CLASS_TYPE = adsk.core.Plane.classType()  # Cached so face scans skip the API chain
+HEX_EDGE_PAIRS = ((0, 1), (1, 2), (2, 3), (3, 4), (4, 5), (5, 0))  # Corner indices per hex edge
+
+# Unit-radius corner offsets per orientation, scaled by the actual radius
+# at use. Flat-top: first vertex at 0 deg; pointy-top: first vertex at 90 deg.
+UNIT_HEX_FLAT = tuple(
+    (math.cos(i * math.pi / 3), math.sin(i * math.pi / 3))
+    for i in range(6)
+)
+UNIT_HEX_POINTY = tuple(
+    (math.cos(math.pi / 2 + i * math.pi / 3), math.sin(math.pi / 2 + i * math.pi / 3))
+    for i in range(6)
+)
 
 # Global variables for command handlers
 _app = None
@@ -24,6 +38,9 @@ _ui = None
 _selected_edge = None
 _selected_face = None
 _face_width = None
+_face_axes = None  # cached _get_face_axes_from_edge result for the selection
+_dialog_inputs = None  # cached (num, margin, width text, orientation) handles
+_last_width_key = None  # last (num_x, margin, flat_top) shown in the dialog
 _handlers = []
 
 
@@ -33,42 +50,39 @@ def _get_face_from_edge(edge):
     (most likely to be the intended target for hex pattern).
     Returns None if no planar face found.
     """
-    planar_faces = []
+    # Single pass: track the largest planar face while scanning. The common
+    # case is a single planar face, so defer the face.area queries until a
+    # second planar candidate actually shows up.
+    best_face = None
+    best_area = None
     for face in edge.faces:
-        # Check if face is planar
-        if face.geometry.objectType == adsk.core.Plane.classType():
-            planar_faces.append(face)
-
-    if not planar_faces:
-        return None
-
-    if len(planar_faces) == 1:
-        return planar_faces[0]
-
-    # Multiple planar faces - pick the largest one
-    largest_face = None
-    largest_area = 0
-    for face in planar_faces:
+        if face.geometry.objectType != PLANE_CLASS_TYPE:
+            continue
+        if best_face is None:
+            best_face = face
+            continue
+        if best_area is None:
+            best_area = best_face.area
         area = face.area
-        if area > largest_area:
-            largest_area = area
-            largest_face = face
+        if area > best_area:
+            best_area = area
+            best_face = face
 
-    return largest_face
+    return best_face
 
 
-def _get_face_dimensions_from_edge(face, edge, sketch):
-    """Get the dimensions of a rectangular face, with width along the edge direction.
+def _get_face_axes_from_edge(face, edge):
+    """Measure a rectangular face's UV axes straight from its surface
+    evaluator - no sketch required.
 
     Returns:
-        (width, height, edge_is_along_sketch_x, sketch_center_x, sketch_center_y, start_from_min)
-        - width: face dimension along the selected edge
-        - height: face dimension perpendicular to the selected edge
-        - edge_is_along_sketch_x: True if selected edge aligns with sketch X axis
-        - sketch_center_x/y: face center in sketch coordinates
-        - start_from_min: True if pattern should start from min side (edge position)
+        (u_length, v_length, edge_along_u, face_center, edge_mid)
+        - u_length/v_length: face extents along the U/V parameter axes
+          (these become sketch X/Y when a sketch is created on the face)
+        - edge_along_u: True if the selected edge runs along the U axis
+        - face_center/edge_mid: world-space (x, y, z) tuples
+        Returns None if the face could not be evaluated.
     """
-    # Get face's UV parameter range (this is what the sketch will use)
     evaluator = face.evaluator
     param_range = evaluator.parametricRange()
     if not param_range:
@@ -77,86 +91,106 @@ def _get_face_dimensions_from_edge(face, edge, sketch):
     param_min = param_range.minPoint
     param_max = param_range.maxPoint
 
-    # Get corner points to determine face orientation
-    (ret, corner1) = evaluator.getPointAtParameter(param_min)
-    if not ret:
-        return None
-    (ret, corner2) = evaluator.getPointAtParameter(adsk.core.Point2D.create(param_max.x, param_min.y))
-    if not ret:
-        return None
-    (ret, corner3) = evaluator.getPointAtParameter(param_max)
-    if not ret:
+    # Get corner points to determine face orientation - one batched
+    # evaluator query instead of three separate API crossings
+    (ret, corners) = evaluator.getPointsAtParameters([
+        param_min,
+        adsk.core.Point2D.create(param_max.x, param_min.y),
+        param_max,
+    ])
+    if not ret or len(corners) != 3:
         return None
+    corner1, corner2, corner3 = corners
+
+    # Read each corner coordinate once - every .x/.y/.z access on an API
+    # point is a property call into the wrapper
+    c1x, c1y, c1z = corner1.x, corner1.y, corner1.z
+    c2x, c2y, c2z = corner2.x, corner2.y, corner2.z
+    c3x, c3y, c3z = corner3.x, corner3.y, corner3.z
+
+    # U direction (becomes sketch X) - plain floats, no distanceTo calls
+    sxx = c2x - c1x
+    sxy = c2y - c1y
+    sxz = c2z - c1z
+    u_length = math.hypot(sxx, sxy, sxz)
+    sxx, sxy, sxz = sxx / u_length, sxy / u_length, sxz / u_length
+
+    # V direction (becomes sketch Y)
+    vx = c3x - c2x
+    vy = c3y - c2y
+    vz = c3z - c2z
+    v_length = math.hypot(vx, vy, vz)
+
+    # Get edge direction - same local-float treatment for the vertices
+    edge_start = edge.startVertex.geometry
+    edge_end = edge.endVertex.geometry
+    esx, esy, esz = edge_start.x, edge_start.y, edge_start.z
+    eex, eey, eez = edge_end.x, edge_end.y, edge_end.z
+    exx = eex - esx
+    exy = eey - esy
+    exz = eez - esz
+    e_len = math.hypot(exx, exy, exz)
+    exx, exy, exz = exx / e_len, exy / e_len, exz / e_len
+
+    # Check if edge is parallel to U or V
+    # Use dot product - if ~1 or ~-1, they're parallel
+    dot = abs(sxx * exx + sxy * exy + sxz * exz)
 
-    # Sketch X direction (along U parameter)
-    sketch_x_length = corner1.distanceTo(corner2)
-    # Sketch Y direction (along V parameter)
-    sketch_y_length = corner2.distanceTo(corner3)
+    face_center = ((c1x + c3x) / 2, (c1y + c3y) / 2, (c1z + c3z) / 2)
+    edge_mid = ((esx + eex) / 2, (esy + eey) / 2, (esz + eez) / 2)
 
-    # Get sketch X direction vector
-    sketch_x_vec = adsk.core.Vector3D.create(
-        corner2.x - corner1.x,
-        corner2.y - corner1.y,
-        corner2.z - corner1.z
-    )
-    sketch_x_vec.normalize()
+    return (u_length, v_length, dot > 0.9, face_center, edge_mid)
 
-    # Get edge direction
-    edge_start = edge.startVertex.geometry
-    edge_end = edge.endVertex.geometry
-    edge_vec = adsk.core.Vector3D.create(
-        edge_end.x - edge_start.x,
-        edge_end.y - edge_start.y,
-        edge_end.z - edge_start.z
-    )
-    edge_vec.normalize()
 
-    # Calculate face center in world coordinates
-    face_center_world = adsk.core.Point3D.create(
-        (corner1.x + corner3.x) / 2,
-        (corner1.y + corner3.y) / 2,
-        (corner1.z + corner3.z) / 2
-    )
+def _get_face_dimensions_from_edge(face, edge, sketch, axes=None):
+    """Get the dimensions of a rectangular face, with width along the edge direction.
 
-    # Calculate edge midpoint in world coordinates
-    edge_mid_world = adsk.core.Point3D.create(
-        (edge_start.x + edge_end.x) / 2,
-        (edge_start.y + edge_end.y) / 2,
-        (edge_start.z + edge_end.z) / 2
-    )
+    Args:
+        axes: Optional result of a previous _get_face_axes_from_edge call
+            for the same face/edge pair; skips re-running the evaluator.
+
+    Returns:
+        (width, height, edge_is_along_sketch_x, sketch_center_x, sketch_center_y, start_from_min)
+        - width: face dimension along the selected edge
+        - height: face dimension perpendicular to the selected edge
+        - edge_is_along_sketch_x: True if selected edge aligns with sketch X axis
+        - sketch_center_x/y: face center in sketch coordinates
+        - start_from_min: True if pattern should start from min side (edge position)
+    """
+    if axes is None:
+        axes = _get_face_axes_from_edge(face, edge)
+    if not axes:
+        return None
+    u_length, v_length, edge_along_u, face_center, edge_mid = axes
+
+    fcx, fcy, fcz = face_center
+    emx, emy, emz = edge_mid
 
-    # Transform both to sketch coordinates
+    # Transform both to sketch coordinates. Read the inverted matrix out
+    # once and apply the affine transform as plain float math - no
+    # Point3D.create/transformBy round-trips per point.
     sketch_transform = sketch.transform
     sketch_transform.invert()
+    m = sketch_transform.asArray()
 
-    face_center_sketch = adsk.core.Point3D.create(
-        face_center_world.x, face_center_world.y, face_center_world.z
-    )
-    face_center_sketch.transformBy(sketch_transform)
-    sketch_center_x = face_center_sketch.x
-    sketch_center_y = face_center_sketch.y
-
-    edge_mid_sketch = adsk.core.Point3D.create(
-        edge_mid_world.x, edge_mid_world.y, edge_mid_world.z
-    )
-    edge_mid_sketch.transformBy(sketch_transform)
+    sketch_center_x = m[0] * fcx + m[1] * fcy + m[2] * fcz + m[3]
+    sketch_center_y = m[4] * fcx + m[5] * fcy + m[6] * fcz + m[7]
 
-    # Check if edge is parallel to sketch X or sketch Y
-    # Use dot product - if ~1 or ~-1, they're parallel
-    dot = abs(sketch_x_vec.dotProduct(edge_vec))
+    edge_mid_x = m[0] * emx + m[1] * emy + m[2] * emz + m[3]
+    edge_mid_y = m[4] * emx + m[5] * emy + m[6] * emz + m[7]
 
     # Determine which side of the face the edge is on
-    edge_on_min_x = edge_mid_sketch.x < sketch_center_x
-    edge_on_min_y = edge_mid_sketch.y < sketch_center_y
+    edge_on_min_x = edge_mid_x < sketch_center_x
+    edge_on_min_y = edge_mid_y < sketch_center_y
 
-    if dot > 0.9:  # Edge is along sketch X direction
+    if edge_along_u:  # Edge is along sketch X direction
         # Width (hexNumX) is along X, height is along Y
         # Pattern should start Y from the selected edge side
-        return (sketch_x_length, sketch_y_length, True, sketch_center_x, sketch_center_y, edge_on_min_y)
+        return (u_length, v_length, True, sketch_center_x, sketch_center_y, edge_on_min_y)
     else:  # Edge is along sketch Y direction
         # Width (hexNumX) is along Y, height is along X
         # Pattern should start X from the selected edge side
-        return (sketch_y_length, sketch_x_length, False, sketch_center_x, sketch_center_y, edge_on_min_x)
+        return (v_length, u_length, False, sketch_center_x, sketch_center_y, edge_on_min_x)
 
 
 def _calculate_hex_layout(face_width, face_height, num_x, margin, flat_top=False, start_from_min_y=True, allow_partial=False):
@@ -172,7 +206,8 @@ def _calculate_hex_layout(face_width, face_height, num_x, margin, flat_top=False
         allow_partial: If True, include partial hexes at edges; if False, only full hexes
 
     Returns:
-        (radius, centers, flat_top) - circumradius, list of (x,y) centers, orientation
+        (radius, centers_x, centers_y, flat_top) - circumradius, parallel
+        lists of hex center x/y coordinates (structure-of-arrays), orientation
     """
     if flat_top:
         # Flat-top hex: flat edges at top/bottom, vertices on sides
@@ -212,87 +247,102 @@ def _calculate_hex_layout(face_width, face_height, num_x, margin, flat_top=False
     # X direction (width): exactly num_x hexes, no overspill (user-defined for symmetry)
     # Y direction (height): allow overspill to fill entire face with partial hexes
     # Y starts from selected edge side (min or max Y)
-    centers = []
-
-    start_x = min_x + hex_half_width
-
-    if start_from_min_y:
-        start_y = min_y + hex_half_height
-        y_direction = 1
-    else:
-        start_y = max_y - hex_half_height
-        y_direction = -1
-
-    # For partial hexes, start one row earlier to catch partials on the first edge
-    first_row = -1 if allow_partial else 0
 
-    row = first_row
-    while True:
-        y = start_y + row * row_spacing * y_direction
+    # Hoist the tolerance-padded bounds out of the loops
+    min_x_tol = min_x - TOLERANCE
+    max_x_tol = max_x + TOLERANCE
 
-        # Y direction boundary check
-        if allow_partial:
-            # Stop only when hex is completely beyond the face
-            if y_direction > 0:
-                if y - hex_half_height > max_y + 0.001:
-                    break
-            else:
-                if y + hex_half_height < min_y - 0.001:
-                    break
-            # Also skip if hex is completely before the face (for row -1 check)
-            if y_direction > 0:
-                if y + hex_half_height < min_y - 0.001:
-                    row += 1
-                    continue
-            else:
-                if y - hex_half_height > max_y + 0.001:
-                    row += 1
-                    continue
-        else:
-            # Stop if hex would extend beyond face (full hexes only)
-            if y_direction > 0:
-                if y + hex_half_height > max_y + 0.001:
-                    break
-            else:
-                if y - hex_half_height < min_y - 0.001:
-                    break
+    start_x = min_x + hex_half_width
 
-        # Odd rows offset horizontally (use absolute row index for offset calc)
-        x_offset = row_x_offset if (abs(row) % 2 == 1) else 0
+    def _row_x_values(x_offset):
+        """X centers for one row at the given parity offset.
 
+        The column range is known in closed form, so the row is built as a
+        single comprehension instead of probing columns one at a time.
+        """
+        base = start_x + x_offset
         if allow_partial:
-            # Add partial hex on left edge if visible
-            left_hex_x = start_x + x_offset - col_spacing
-            if left_hex_x + hex_half_width > min_x - 0.001:
-                centers.append((left_hex_x, y))
-
-            # X direction: hexes across the row (allow partial on right)
-            col = 0
-            while True:
-                x = start_x + col * col_spacing + x_offset
-
-                # Stop if hex is completely beyond face
-                if x - hex_half_width > max_x + 0.001:
-                    break
-
-                centers.append((x, y))
-                col += 1
+            # Last column is the one whose left edge is still inside the
+            # face; a left partial precedes column 0 when visible
+            last_col = int(math.floor((max_x_tol + hex_half_width - base) / col_spacing))
+            xs = [base + col * col_spacing for col in range(last_col + 1)]
+            left_hex_x = base - col_spacing
+            if left_hex_x + hex_half_width > min_x_tol:
+                xs.insert(0, left_hex_x)
         else:
-            # Only full hexes - must fit entirely within face
-            col = 0
-            while col < num_x:
-                x = start_x + col * col_spacing + x_offset
-
-                # Stop if hex right edge would extend beyond face
-                if x + hex_half_width > max_x + 0.001:
-                    break
-
-                centers.append((x, y))
-                col += 1
+            # Full hexes only - capped at the requested count
+            last_col = min(
+                num_x - 1,
+                int(math.floor((max_x_tol - hex_half_width - base) / col_spacing))
+            )
+            xs = [base + col * col_spacing for col in range(last_col + 1)]
+        return xs
+
+    # The face is centered on the sketch origin, so the y bounds are
+    # symmetric and a single sign factor covers both start sides: one start
+    # formula and one set of boundary tests instead of branching per case.
+    sign = 1.0 if start_from_min_y else -1.0
+    start_y = sign * (hex_half_height - max_y)
+
+    # X positions only depend on row parity, so compute the two variants
+    # once and reuse them for every row
+    even_row_xs = _row_x_values(0)
+    odd_row_xs = _row_x_values(row_x_offset)
+
+    # The row bounds are known in closed form, so iterate an exact range
+    # instead of probing every candidate row against the face bounds.
+    if allow_partial:
+        # Rows run until a hex lies completely beyond the face. Row -1
+        # catches a partial peeking over the start edge, unless the rows
+        # are spaced too far apart to reach back over it.
+        first_row = -1 if row_spacing <= 2 * hex_half_height + TOLERANCE else 0
+        last_row = int(math.floor((face_height + TOLERANCE) / row_spacing))
+    else:
+        # Full hexes only - the last row must fit entirely within the face
+        first_row = 0
+        last_row = int(math.floor((face_height - 2 * hex_half_height + TOLERANCE) / row_spacing))
+
+    # Emit all even rows, then all odd rows: each batch has a constant
+    # x-list, so there is no per-row parity dispatch and the x coordinates
+    # come from plain list repetition. Drawing order doesn't matter - the
+    # profiles are filtered by geometry afterwards.
+    y_step = row_spacing * sign
+    even_rows = range(first_row + (first_row & 1), last_row + 1, 2)
+    odd_rows = range(first_row + ((first_row + 1) & 1), last_row + 1, 2)
+
+    centers_x = even_row_xs * len(even_rows) + odd_row_xs * len(odd_rows)
+    centers_y = []
+    extend_y = centers_y.extend
+    n_even = len(even_row_xs)
+    n_odd = len(odd_row_xs)
+    for row in even_rows:
+        extend_y([start_y + row * y_step] * n_even)
+    for row in odd_rows:
+        extend_y([start_y + row * y_step] * n_odd)
+
+    return radius, centers_x, centers_y, flat_top
+
+
+def _build_hex_vertices(centers_x, centers_y, hex_offsets):
+    """Compute vertex coordinates for all hexagons in one batched pass.
 
-        row += 1
+    Args:
+        centers_x: List of hex center x coordinates
+        centers_y: List of hex center y coordinates (parallel to centers_x)
+        hex_offsets: List of 6 (dx, dy) vertex offsets from a hex center
 
-    return radius, centers, flat_top
+    Returns:
+        (verts_x, verts_y) - parallel flat lists of vertex coordinates,
+        6 consecutive entries per hexagon
+    """
+    verts_x = []
+    verts_y = []
+    extend_x = verts_x.extend
+    extend_y = verts_y.extend
+    for cx, cy in zip(centers_x, centers_y):
+        extend_x(cx + dx for dx, _ in hex_offsets)
+        extend_y(cy + dy for _, dy in hex_offsets)
+    return verts_x, verts_y
 
 
 def _calculate_hex_width(face_width, num_x, margin, flat_top):
@@ -319,8 +369,10 @@ def _execute_hex_pattern(face, edge, num_x, margin, flat_top, allow_partial=Fals
     comp = face.body.parentComponent
     sketch = comp.sketches.add(face)
 
-    # Get face dimensions using edge as the width direction
-    face_info = _get_face_dimensions_from_edge(face, edge, sketch)
+    # Get face dimensions using edge as the width direction, reusing the
+    # evaluator axes measured when the selection was made - the sketch
+    # transform is the only part that couldn't be computed back then
+    face_info = _get_face_dimensions_from_edge(face, edge, sketch, axes=_face_axes)
     if not face_info:
         _ui.messageBox('HexPattern: Could not analyze face geometry.')
         return
@@ -329,63 +381,94 @@ def _execute_hex_pattern(face, edge, num_x, margin, flat_top, allow_partial=Fals
 
     # Calculate hex layout
     try:
-        radius, centers, flat_top = _calculate_hex_layout(
+        radius, centers_x, centers_y, flat_top = _calculate_hex_layout(
             face_width, face_height, num_x, margin, flat_top, start_from_min, allow_partial
         )
     except RuntimeError as e:
         _ui.messageBox(f'HexPattern: {str(e)}')
         return
 
-    if not centers:
+    if not centers_x:
         _ui.messageBox('HexPattern: No hexagons fit in the selected face.')
         return
 
-    # Defer compute to batch all sketch operations (much faster)
+    # Defer compute to batch all sketch operations (much faster), and turn
+    # off profile/constraint display so Fusion skips the visual bookkeeping
+    # for every added line
     sketch.isComputeDeferred = True
-
-    # Pre-calculate hexagon vertex offsets from center
-    # Flat-top: first vertex at 0°, Pointy-top: first vertex at 90°
-    start_angle = 0 if flat_top else math.pi / 2
-    hex_offsets = [
-        (radius * math.cos(start_angle + i * math.pi / 3),
-         radius * math.sin(start_angle + i * math.pi / 3))
-        for i in range(6)
-    ]
-
-    # Draw all hexagons
-    lines = sketch.sketchCurves.sketchLines
-    for cx, cy in centers:
-        for i in range(6):
-            hx1 = hex_offsets[i][0]
-            hy1 = hex_offsets[i][1]
-            hx2 = hex_offsets[(i + 1) % 6][0]
-            hy2 = hex_offsets[(i + 1) % 6][1]
-
-            if edge_is_along_x:
-                x1 = sketch_center_x + cx + hx1
-                y1 = sketch_center_y + cy + hy1
-                x2 = sketch_center_x + cx + hx2
-                y2 = sketch_center_y + cy + hy2
-            else:
-                x1 = sketch_center_x + cy + hy1
-                y1 = sketch_center_y + cx - hx1
-                x2 = sketch_center_x + cy + hy2
-                y2 = sketch_center_y + cx - hx2
-
-            lines.addByTwoPoints(
-                adsk.core.Point3D.create(x1, y1, 0),
-                adsk.core.Point3D.create(x2, y2, 0)
-            )
+    try:
+        sketch.areProfilesShown = False
+        sketch.areConstraintsShown = False
+    except:
+        pass
+
+    # Scale the cached unit-radius corner offsets for this orientation -
+    # no trig at run time
+    unit = UNIT_HEX_FLAT if flat_top else UNIT_HEX_POINTY
+
+    # Resolve the pattern-axis orientation once, up front: when the
+    # selected edge runs along sketch Y, centers are mirrored across the
+    # diagonal (x, y) -> (y, x) - with the SoA layout that is just swapping
+    # the two list references - and corner offsets are rotated -90 degrees
+    # (dx, dy) -> (dy, -dx), folded into the same pass that scales the
+    # unit offsets by the radius.
+    # The face-center offset is folded into the centers here, one add per
+    # hex instead of one per vertex, so the vertex pass below emits final
+    # sketch coordinates directly.
+    if edge_is_along_x:
+        draw_cx = [sketch_center_x + cx for cx in centers_x]
+        draw_cy = [sketch_center_y + cy for cy in centers_y]
+        hex_offsets = [(radius * ux, radius * uy) for ux, uy in unit]
+    else:
+        draw_cx = [sketch_center_x + cy for cy in centers_y]
+        draw_cy = [sketch_center_y + cx for cx in centers_x]
+        hex_offsets = [(radius * uy, -radius * ux) for ux, uy in unit]
+
+    # Batch-compute all vertex coordinates before touching the sketch API
+    verts_x, verts_y = _build_hex_vertices(draw_cx, draw_cy, hex_offsets)
+
+    # Draw all hexagons. Fusion has no bulk polyline-creation API, so each
+    # edge is still one addByTwoPoints call; bind the constructor and the
+    # add method to locals once to avoid re-resolving the attribute chains
+    # 12 times per hexagon.
+    add_line = sketch.sketchCurves.sketchLines.addByTwoPoints
+    create_point = adsk.core.Point3D.create
+
+    # Corner points are shared between the edges of one hex and, at zero
+    # margin, between neighbouring hexes too. Dedupe the Point3D wrappers
+    # through a rounded-coordinate map so each unique corner is built once.
+    point_cache = {}
+    for base in range(0, len(verts_x), 6):
+        pts = []
+        for x, y in zip(verts_x[base:base + 6], verts_y[base:base + 6]):
+            key = (round(x, 7), round(y, 7))
+            pt = point_cache.get(key)
+            if pt is None:
+                pt = create_point(x, y, 0)
+                point_cache[key] = pt
+            pts.append(pt)
+        for i, j in HEX_EDGE_PAIRS:
+            add_line(pts[i], pts[j])
 
     # Re-enable compute to create profiles
+    try:
+        sketch.areProfilesShown = True
+        sketch.areConstraintsShown = True
+    except:
+        pass
     sketch.isComputeDeferred = False
-    adsk.doEvents()
 
+    # Reading the profile collection forces the sketch evaluation we need;
+    # no reason to pump the whole UI message loop with adsk.doEvents()
     profiles = sketch.profiles
-    hex_profiles = adsk.core.ObjectCollection.create()
+    if profiles.count == 0:
+        # Unhappy path: the sketch hasn't recomputed yet. Yield to the UI
+        # thread once and re-read before concluding there are no profiles.
+        adsk.doEvents()
+        profiles = sketch.profiles
 
     # Expected hex area - used to filter profiles
-    expected_area = 3 * SQRT3 / 2 * radius * radius
+    expected_area = HEX_AREA_K * radius * radius
     # Min area depends on whether we allow partial hexes:
     # - With partials: small enough for corner partials, large enough to exclude margin slivers
     # - Without partials: only full hexes (>90% of expected area)
@@ -395,23 +478,61 @@ def _execute_hex_pattern(face, edge, num_x, margin, flat_top, allow_partial=Fals
         min_area = expected_area * 0.90  # 90% for full hexes only
     max_area = expected_area * MAX_AREA_RATIO
 
-    for i in range(profiles.count):
-        profile = profiles.item(i)
-        try:
-            area = profile.areaProperties().area
-            if min_area < area <= max_area:
-                hex_profiles.add(profile)
-        except:
-            pass
-
-    if hex_profiles.count == 0:
+    # Snapshot the profiles once with the item accessor bound to a local
+    item = profiles.item
+    prof_list = [item(i) for i in range(profiles.count)]
+
+    # Cheap prefilter: a full hexagon is a single 6-curve loop whose
+    # bounding box measures 2r x sqrt(3)r (either orientation). Accept
+    # those straight away and only fall back to the expensive
+    # areaProperties call for the ambiguous leftovers - corner partials,
+    # margin slivers and the outer face.
+    dim_a = 2 * radius
+    dim_b = SQRT3 * radius
+    bbox_tol = radius * 0.01
+    matching = []
+    ambiguous = []
+    for profile in prof_list:
+        loops = profile.profileLoops
+        if loops.count != 1:
+            # The leftover face region carries the hex cuts as inner loops;
+            # reject it on loop count alone so it never reaches the
+            # areaProperties pass below
+            continue
+        if loops.item(0).profileCurves.count == 6:
+            bb = profile.boundingBox
+            w = bb.maxPoint.x - bb.minPoint.x
+            h = bb.maxPoint.y - bb.minPoint.y
+            if ((abs(w - dim_a) < bbox_tol and abs(h - dim_b) < bbox_tol) or
+                    (abs(w - dim_b) < bbox_tol and abs(h - dim_a) < bbox_tol)):
+                matching.append(profile)
+                continue
+        ambiguous.append(profile)
+
+    for profile in ambiguous:
+        # areaProperties returns None for degenerate profiles; an explicit
+        # guard avoids installing an exception handler per iteration
+        props = profile.areaProperties()
+        if props and min_area < props.area <= max_area:
+            matching.append(profile)
+
+    # Build the collection in one call where the API supports it; fall back
+    # to per-item adds on older Fusion versions
+    if not matching:
         _ui.messageBox(
             f'HexPattern: No hexagon profiles found.\n'
-            f'Drew {len(centers)} hexagons but could not identify closed profiles.\n'
+            f'Drew {len(centers_x)} hexagons but could not identify closed profiles.\n'
             f'This may happen if hexagons overlap or extend outside the face.'
         )
         return
 
+    try:
+        hex_profiles = adsk.core.ObjectCollection.createWithArray(matching)
+    except AttributeError:
+        hex_profiles = adsk.core.ObjectCollection.create()
+        for p in matching:
+            hex_profiles.add(p)
+
     # Cut the hexagons through the body
     extrudes = comp.features.extrudeFeatures
     cut_input = extrudes.createInput(hex_profiles, adsk.fusion.FeatureOperations.CutFeatureOperation)
@@ -434,7 +555,7 @@ def _execute_hex_pattern(face, edge, num_x, margin, flat_top, allow_partial=Fals
             pass
 
     _ui.messageBox(
-        f'HexPattern: Created {hex_profiles.count} hexagon cuts.\n'
+        f'HexPattern: Created {len(matching)} hexagon cuts.\n'
         f'Hex width: {_calculate_hex_width(face_width, num_x, margin, flat_top) * 10:.2f} mm'
     )
 
@@ -445,6 +566,8 @@ class HexPatternCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
 
     def notify(self, args):
         try:
+            global _dialog_inputs, _last_width_key
+
             cmd = args.command
             cmd.setDialogMinimumSize(300, 200)
             inputs = cmd.commandInputs
@@ -467,6 +590,11 @@ class HexPatternCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
             # Add partial hexes option
             inputs.addBoolValueInput('allowPartial', 'Cut partial hexes at edges', True, '', False)
 
+            # Cache the input handles so every input-changed event doesn't
+            # re-run four itemById lookups
+            _dialog_inputs = (num_input, margin_input, hex_width_text, orientation_group)
+            _last_width_key = None
+
             _update_hex_width_display(inputs)
 
             # Connect to input changed event
@@ -528,21 +656,29 @@ class HexPatternDestroyHandler(adsk.core.CommandEventHandler):
         super().__init__()
 
     def notify(self, args):
-        # Terminate the script when dialog closes
+        # Drop the cached dialog handles and terminate the script
+        global _dialog_inputs, _last_width_key
+        _dialog_inputs = None
+        _last_width_key = None
         adsk.terminate()
 
 
 def _update_hex_width_display(inputs):
     """Update the hex width info text based on current inputs."""
-    global _face_width
+    global _face_width, _last_width_key
 
     if _face_width is None:
         return
 
-    num_input = inputs.itemById('numHexes')
-    margin_input = inputs.itemById('margin')
-    hex_width_text = inputs.itemById('hexWidthInfo')
-    orientation_group = inputs.itemById('orientation')
+    # Use the handles cached at dialog creation; fall back to itemById
+    # lookups if the dialog isn't the one we cached for
+    if _dialog_inputs is not None:
+        num_input, margin_input, hex_width_text, orientation_group = _dialog_inputs
+    else:
+        num_input = inputs.itemById('numHexes')
+        margin_input = inputs.itemById('margin')
+        hex_width_text = inputs.itemById('hexWidthInfo')
+        orientation_group = inputs.itemById('orientation')
 
     if not all([num_input, margin_input, hex_width_text, orientation_group]):
         return
@@ -551,6 +687,13 @@ def _update_hex_width_display(inputs):
     margin = margin_input.value  # Internal units (cm)
     flat_top = orientation_group.selectedItem.name == 'Flat Top'
 
+    # Input-changed fires for inputs that don't affect the width (e.g. the
+    # partial-hex checkbox) - skip the recompute and text update then
+    key = (num_x, margin, flat_top)
+    if key == _last_width_key:
+        return
+    _last_width_key = key
+
     hex_width = _calculate_hex_width(_face_width, num_x, margin, flat_top)
 
     if hex_width <= 0:
@@ -562,7 +705,7 @@ def _update_hex_width_display(inputs):
 
 def _run_impl(app, ui):
     """Main implementation logic - validates selection and shows dialog."""
-    global _selected_edge, _selected_face, _face_width
+    global _selected_edge, _selected_face, _face_width, _face_axes
 
     design = adsk.fusion.Design.cast(app.activeProduct)
     if not design:
@@ -592,18 +735,16 @@ def _run_impl(app, ui):
     _selected_edge = edge
     _selected_face = face
 
-    # Calculate face width for the dialog
-    # We need a temporary sketch to get face dimensions
-    comp = face.body.parentComponent
-    temp_sketch = comp.sketches.add(face)
-    face_info = _get_face_dimensions_from_edge(face, edge, temp_sketch)
-    temp_sketch.deleteMe()
-
-    if not face_info:
+    # Calculate face width for the dialog - measured straight from the
+    # surface evaluator, no temporary sketch needed
+    axes = _get_face_axes_from_edge(face, edge)
+    if not axes:
         ui.messageBox('HexPattern: Could not analyze face geometry.')
         return
 
-    _face_width = face_info[0]  # Store face width for hex width calculation
+    u_length, v_length, edge_along_u = axes[0], axes[1], axes[2]
+    _face_width = u_length if edge_along_u else v_length  # width along the edge
+    _face_axes = axes  # reused by the execute handler for the same selection
 
     # Create and show the command dialog
     cmdDefs = ui.commandDefinitions
@@ -20,11 +20,20 @@ import adsk.fusion
 import traceback
 import math
 
+try:
+    import numpy as np
+except ImportError:
+    # Fusion's embedded Python ships without NumPy - fall back to pure Python
+    np = None
+
 # Prefix for generated features - only items with this prefix will be auto-deleted
 GENERATED_PREFIX = "pc#"
 # Attribute group/name used to tag generated sketch texts
 ATTR_GROUP = "PatternedCount"
 ATTR_NAME = "generated"
+# Parameter-string lookup tables; unknown values keep the documented defaults
+_DIRECTIONS = {"+X": (1, 0), "-X": (-1, 0), "+Y": (0, 1), "-Y": (0, -1)}
+_ARC_CLOCKWISE = {"CW": True, "CCW": False}
 
 
 def _get_user_param(design, name, required=True):
@@ -404,23 +413,51 @@ def _collect_valid_profiles(sketch, text_boxes, text_height, max_char_area, is_c
 
 def _filter_outer_profiles(valid_profiles):
     """Filter out inner profiles (holes inside other profiles)."""
+    n = len(valid_profiles)
+
+    if np is not None and n > 2:
+        # Vectorized pairwise containment: four (n,) coordinate arrays and
+        # one (n,n) broadcast instead of the quadratic Python loop. The
+        # strict inequalities keep the diagonal False by construction, so
+        # no self-containment masking is needed.
+        min_x = np.fromiter((p['min'][0] for p in valid_profiles), dtype=np.float64, count=n)
+        min_y = np.fromiter((p['min'][1] for p in valid_profiles), dtype=np.float64, count=n)
+        max_x = np.fromiter((p['max'][0] for p in valid_profiles), dtype=np.float64, count=n)
+        max_y = np.fromiter((p['max'][1] for p in valid_profiles), dtype=np.float64, count=n)
+
+        # inside[i, j]: profile j strictly contains profile i
+        inside = ((min_x[None, :] < min_x[:, None]) &
+                  (min_y[None, :] < min_y[:, None]) &
+                  (max_x[None, :] > max_x[:, None]) &
+                  (max_y[None, :] > max_y[:, None]))
+        return [valid_profiles[i] for i in np.flatnonzero(~inside.any(axis=1))]
+
     def is_contained_in(inner, outer):
         return (outer['min'][0] < inner['min'][0] and
                 outer['min'][1] < inner['min'][1] and
                 outer['max'][0] > inner['max'][0] and
                 outer['max'][1] > inner['max'][1])
 
-    outer_profiles = []
-    for p in valid_profiles:
-        is_inner = False
-        for other in valid_profiles:
-            if p is not other and is_contained_in(p, other):
-                is_inner = True
+    # Sweep in x instead of testing every pair: visiting profiles in
+    # min-x order, only the still-open boxes to the left (max_x past the
+    # current min_x) can possibly contain the current one. For engraved
+    # digits laid out along a line the active set stays tiny, so this is
+    # O(n log n) typical against the quadratic full scan.
+    min_xs = [p['min'][0] for p in valid_profiles]
+    order = sorted(range(n), key=min_xs.__getitem__)
+    active = []
+    is_inner = [False] * n
+    for i in order:
+        p = valid_profiles[i]
+        p_min_x = p['min'][0]
+        active = [j for j in active if valid_profiles[j]['max'][0] > p_min_x]
+        for j in active:
+            if is_contained_in(p, valid_profiles[j]):
+                is_inner[i] = True
                 break
-        if not is_inner:
-            outer_profiles.append(p)
+        active.append(i)
 
-    return outer_profiles
+    return [p for i, p in enumerate(valid_profiles) if not is_inner[i]]
 
 
 def _create_cuts_and_bodies(comp, sketch, outer_profiles, cut_depth, text_boxes, is_circular,
@@ -575,8 +612,7 @@ def _run_impl(app, ui):
         arc_clockwise = False
         if arc_dir_param:
             arc_str = arc_dir_param.expression.strip().strip("'\"").upper()
-            if arc_str == "CW":
-                arc_clockwise = True
+            arc_clockwise = _ARC_CLOCKWISE.get(arc_str, False)
         segment_angle = 2 * math.pi / seg_count
         if arc_clockwise:
             segment_angle = -segment_angle
@@ -587,12 +623,7 @@ def _run_impl(app, ui):
         dir_x, dir_y = 1, 0
         if dir_param:
             dir_str = dir_param.expression.strip().strip("'\"").upper()
-            if dir_str == "-X":
-                dir_x, dir_y = -1, 0
-            elif dir_str == "+Y":
-                dir_x, dir_y = 0, 1
-            elif dir_str == "-Y":
-                dir_x, dir_y = 0, -1
+            dir_x, dir_y = _DIRECTIONS.get(dir_str, (1, 0))
 
     # Ensure sketch is visible
     sketch.isLightBulbOn = True
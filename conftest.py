@@ -0,0 +1,37 @@
+# conftest.py
+# Shared test setup: stub the adsk modules once per session (pytest imports
+# this before any test module) and put the add-in folders on sys.path.
+
+import os
+import sys
+import types
+
+
+class _AdskStubModule(types.ModuleType):
+    """Stand-in for the adsk modules: attribute access creates plain
+    classes on demand. Much lighter than MagicMock - no child-mock
+    allocation or call recording - while still supporting subclassing
+    and the classType() calls the add-ins make at import time.
+    """
+
+    def __getattr__(self, name):
+        cls = type(name, (), {
+            'classType': classmethod(lambda cls: f'adsk::{cls.__name__}'),
+        })
+        setattr(self, name, cls)
+        return cls
+
+
+if 'adsk' not in sys.modules:
+    _adsk = _AdskStubModule('adsk')
+    _adsk.core = _AdskStubModule('adsk.core')
+    _adsk.fusion = _AdskStubModule('adsk.fusion')
+    sys.modules['adsk'] = _adsk
+    sys.modules['adsk.core'] = _adsk.core
+    sys.modules['adsk.fusion'] = _adsk.fusion
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+for _addin in ('HexPattern', 'PatternedCount'):
+    _path = os.path.join(_ROOT, _addin)
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
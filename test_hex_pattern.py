@@ -3,69 +3,113 @@
 #
 # Run with: python -m pytest test_hex_pattern.py -v
 
+import bisect
+import functools
 import math
+
+import numpy as np
 import pytest
-from unittest.mock import MagicMock
-import sys
-
-# Mock the adsk module before importing HexPattern
-adsk_mock = MagicMock()
-adsk_mock.core = MagicMock()
-adsk_mock.fusion = MagicMock()
-sys.modules['adsk'] = adsk_mock
-sys.modules['adsk.core'] = adsk_mock.core
-sys.modules['adsk.fusion'] = adsk_mock.fusion
-
-# Now we can import our module
-sys.path.insert(0, 'HexPattern')
+
+# conftest.py stubs the adsk modules and sets up sys.path before this import
 import HexPattern as hp
 
+SQRT3 = math.sqrt(3.0)
+
+
+@functools.lru_cache(maxsize=64)
+def _hex_layout(face_width, face_height, num_x, margin, flat_top=False,
+                start_from_min_y=True, allow_partial=False):
+    """Memoized _calculate_hex_layout - many tests share parameter sets.
+
+    The center lists come back as read-only float64 arrays: structure-of-
+    arrays consumers can mask/sort them directly, and a test can't mutate
+    the cached result. HexPattern itself keeps returning plain lists -
+    it runs in Fusion's NumPy-less embedded Python.
+    """
+    radius, xs, ys, flat = hp._calculate_hex_layout(
+        face_width, face_height, num_x, margin,
+        flat_top=flat_top, start_from_min_y=start_from_min_y,
+        allow_partial=allow_partial,
+    )
+    xs_a = np.asarray(xs, dtype=np.float64)
+    ys_a = np.asarray(ys, dtype=np.float64)
+    xs_a.setflags(write=False)
+    ys_a.setflags(write=False)
+    return radius, xs_a, ys_a, flat
+
+
+@functools.lru_cache(maxsize=64)
+def _hex_rows(face_width, face_height, num_x, margin, flat_top=False,
+              start_from_min_y=True, allow_partial=False):
+    """Row decomposition of the cached layout, ascending in y.
+
+    Sorts the centers by y once and splits at gaps wider than the row
+    tolerance, so tests index whole rows directly instead of re-scanning
+    the full center array for every row lookup.
+
+    Returns (row_ys, row_xs): per-row center y values and, per row, the
+    x coordinates sorted ascending.
+    """
+    _, xs, ys, _ = _hex_layout(
+        face_width, face_height, num_x, margin,
+        flat_top=flat_top, start_from_min_y=start_from_min_y,
+        allow_partial=allow_partial,
+    )
+    order = np.argsort(ys, kind='stable')
+    ys_sorted = ys[order]
+    xs_sorted = xs[order]
+    breaks = np.flatnonzero(np.diff(ys_sorted) > 1e-3) + 1
+    row_ys = tuple(seg[0] for seg in np.split(ys_sorted, breaks))
+    row_xs = tuple(np.sort(seg) for seg in np.split(xs_sorted, breaks))
+    return row_ys, row_xs
+
+
+def _row_index_near(row_ys, target_y, tol=0.01):
+    """Index of the row whose y lies within tol of target_y, else None.
+
+    row_ys is sorted ascending, so one bisect probe replaces a scan.
+    """
+    i = bisect.bisect_left(row_ys, target_y)
+    for j in (i - 1, i):
+        if 0 <= j < len(row_ys) and abs(row_ys[j] - target_y) < tol:
+            return j
+    return None
+
 
 class TestHexLayoutGeometry:
     """Tests for _calculate_hex_layout geometry calculations."""
 
-    def test_flat_top_dimensions(self):
-        """Verify flat-top hex dimensions: width = 2r, height = sqrt(3)*r.
+    @pytest.mark.parametrize("flat_top", [True, False])
+    def test_hex_dimensions(self, flat_top):
+        """Verify hex dimensions for both orientations.
 
-        Flat-top hexes in honeycomb are spaced 3r apart (center to center in same row).
-        For num_x hexes: face_width = r + (num_x-1)*3r + r = r*(3*num_x - 1)
-        So: radius = face_width / (3*num_x - 1)
+        Flat-top: width = 2r, height = sqrt(3)*r; hexes in a row are spaced
+        3r apart, so face_width = r + (num_x-1)*3r + r = r*(3*num_x - 1).
+        Pointy-top: width = sqrt(3)*r, height = 2r; hexes sit side by side,
+        so each is face_width/num_x wide.
         """
         face_width = 10.0  # cm (internal units)
         face_height = 10.0
         num_x = 5
         margin = 0.0
 
-        radius, centers, flat = hp._calculate_hex_layout(
-            face_width, face_height, num_x, margin, flat_top=True
+        radius, xs, ys, flat = _hex_layout(
+            face_width, face_height, num_x, margin, flat_top=flat_top
         )
 
-        hex_width = 2 * radius
-        hex_height = math.sqrt(3) * radius
+        if flat_top:
+            # With 5 hexes and no margin: radius = 10 / (3*5 - 1) = 10/14 = 0.714...
+            expected_radius = face_width / (3 * num_x - 1)
+            hex_width = 2 * radius
+            expected_width = 2 * expected_radius
+        else:
+            # With 5 hexes and no margin, each hex should be 2cm wide
+            expected_radius = (face_width / num_x) / SQRT3
+            hex_width = SQRT3 * radius
+            expected_width = 2.0
 
-        # With 5 hexes and no margin: radius = 10 / (3*5 - 1) = 10/14 = 0.714...
-        expected_radius = face_width / (3 * num_x - 1)
-        assert abs(radius - expected_radius) < 0.0001
-        # Width = 2r, Height = sqrt(3) * r
-        assert abs(hex_width - 2 * expected_radius) < 0.0001
-        assert abs(hex_height - math.sqrt(3) * expected_radius) < 0.0001
-
-    def test_pointy_top_dimensions(self):
-        """Verify pointy-top hex dimensions: width = sqrt(3)*r, height = 2r."""
-        face_width = 10.0
-        face_height = 10.0
-        num_x = 5
-        margin = 0.0
-
-        radius, centers, flat = hp._calculate_hex_layout(
-            face_width, face_height, num_x, margin, flat_top=False
-        )
-
-        hex_width = math.sqrt(3) * radius
-        hex_height = 2 * radius
-
-        # With 5 hexes and no margin, each hex should be 2cm wide
-        assert abs(hex_width - 2.0) < 0.0001
+        assert radius == pytest.approx(expected_radius, abs=0.0001)
+        assert hex_width == pytest.approx(expected_width, abs=0.0001)
 
     def test_row_spacing_no_margin_flat_top(self):
         """Row spacing with no margin should be 0.5 * hex_height for flat-top.
@@ -77,22 +121,19 @@ class TestHexLayoutGeometry:
         num_x = 5
         margin = 0.0
 
-        radius, centers, _ = hp._calculate_hex_layout(
+        radius, xs, ys, _ = _hex_layout(
             face_width, face_height, num_x, margin, flat_top=True
         )
 
-        hex_height = math.sqrt(3) * radius
+        hex_height = SQRT3 * radius
         # Code uses: row_spacing = 0.5 * hex_height + margin * 0.5 (margin=0 here)
         expected_row_spacing = 0.5 * hex_height
 
-        # Find centers in row 0 and row 1
-        row0_centers = [c for c in centers if abs(c[1] - centers[0][1]) < 0.001]
-        row1_y = centers[0][1] + expected_row_spacing
-        row1_centers = [c for c in centers if abs(c[1] - row1_y) < 0.01]
+        row_ys, _ = _hex_rows(face_width, face_height, num_x, margin, flat_top=True)
 
-        assert len(row1_centers) > 0, "Should have hexes in row 1"
-        actual_row_spacing = row1_centers[0][1] - row0_centers[0][1]
-        assert abs(actual_row_spacing - expected_row_spacing) < 0.001
+        assert len(row_ys) > 1, "Should have hexes in row 1"
+        actual_row_spacing = row_ys[1] - row_ys[0]
+        assert actual_row_spacing == pytest.approx(expected_row_spacing, abs=0.001)
 
     def test_column_spacing_same_row(self):
         """Hexes in same row should be spaced by col_spacing.
@@ -105,7 +146,7 @@ class TestHexLayoutGeometry:
         num_x = 5
         margin = 0.1  # 1mm margin
 
-        radius, centers, _ = hp._calculate_hex_layout(
+        radius, xs, ys, _ = _hex_layout(
             face_width, face_height, num_x, margin, flat_top=True
         )
 
@@ -113,12 +154,12 @@ class TestHexLayoutGeometry:
         expected_col_spacing = 3 * radius + margin
 
         # Get first row centers (sorted by x)
-        first_row_y = centers[0][1]
-        row0_centers = sorted([c for c in centers if abs(c[1] - first_row_y) < 0.001], key=lambda c: c[0])
+        _, row_xs = _hex_rows(face_width, face_height, num_x, margin, flat_top=True)
+        row0_xs = row_xs[0]
 
-        if len(row0_centers) >= 2:
-            actual_spacing = row0_centers[1][0] - row0_centers[0][0]
-            assert abs(actual_spacing - expected_col_spacing) < 0.001
+        if len(row0_xs) >= 2:
+            actual_spacing = row0_xs[1] - row0_xs[0]
+            assert actual_spacing == pytest.approx(expected_col_spacing, abs=0.001)
 
     def test_odd_row_offset(self):
         """Odd rows should be offset by half the column spacing."""
@@ -127,7 +168,7 @@ class TestHexLayoutGeometry:
         num_x = 5
         margin = 0.0
 
-        radius, centers, _ = hp._calculate_hex_layout(
+        radius, xs, ys, _ = _hex_layout(
             face_width, face_height, num_x, margin, flat_top=True
         )
 
@@ -135,18 +176,17 @@ class TestHexLayoutGeometry:
         col_spacing = hex_width + margin
         expected_offset = col_spacing / 2
 
-        # Get row 0 and row 1 centers
-        first_row_y = centers[0][1]
-        row0_centers = sorted([c for c in centers if abs(c[1] - first_row_y) < 0.001], key=lambda c: c[0])
+        # Get row 0 and, if one sits at the expected spacing, row 1
+        row_ys, row_xs = _hex_rows(face_width, face_height, num_x, margin, flat_top=True)
+        row0_xs = row_xs[0]
 
-        row_spacing = (3 / 4) * math.sqrt(3) * radius
-        second_row_y = first_row_y + row_spacing
-        row1_centers = sorted([c for c in centers if abs(c[1] - second_row_y) < 0.01], key=lambda c: c[0])
+        row_spacing = (3 / 4) * SQRT3 * radius
+        row1_idx = _row_index_near(row_ys, row_ys[0] + row_spacing)
 
-        if len(row0_centers) > 0 and len(row1_centers) > 0:
+        if len(row0_xs) > 0 and row1_idx is not None:
             # Row 1's first hex should be offset from row 0's first hex
-            x_diff = row1_centers[0][0] - row0_centers[0][0]
-            assert abs(x_diff - expected_offset) < 0.01
+            x_diff = row_xs[row1_idx][0] - row0_xs[0]
+            assert x_diff == pytest.approx(expected_offset, abs=0.01)
 
     def test_margin_affects_spacing(self):
         """Adding margin should increase both row and column spacing."""
@@ -155,20 +195,20 @@ class TestHexLayoutGeometry:
         num_x = 5
 
         # Without margin
-        _, centers_no_margin, _ = hp._calculate_hex_layout(
+        _, xs_no_margin, ys_no_margin, _ = _hex_layout(
             face_width, face_height, num_x, 0.0, flat_top=True
         )
 
         # With margin
-        _, centers_with_margin, _ = hp._calculate_hex_layout(
+        _, xs_with_margin, ys_with_margin, _ = _hex_layout(
             face_width, face_height, num_x, 0.2, flat_top=True
         )
 
         # With margin, we should have fewer hexes (because they're more spread out)
         # or different spacing
         # Actually hex size changes with margin, so let's just verify both run
-        assert len(centers_no_margin) > 0
-        assert len(centers_with_margin) > 0
+        assert len(xs_no_margin) > 0
+        assert len(xs_with_margin) > 0
 
     def test_hex_count_matches_num_x(self):
         """First row should have num_x hexagons when face is wide enough."""
@@ -177,15 +217,14 @@ class TestHexLayoutGeometry:
         num_x = 5
         margin = 0.0
 
-        radius, centers, _ = hp._calculate_hex_layout(
+        radius, xs, ys, _ = _hex_layout(
             face_width, face_height, num_x, margin, flat_top=True
         )
 
         # Get first row centers
-        first_row_y = centers[0][1]
-        row0_centers = [c for c in centers if abs(c[1] - first_row_y) < 0.001]
+        _, row_xs = _hex_rows(face_width, face_height, num_x, margin, flat_top=True)
 
-        assert len(row0_centers) == num_x
+        assert len(row_xs[0]) == num_x
 
     def test_negative_margin_raises_error(self):
         """Very large margin that results in negative hex width should error."""
@@ -212,25 +251,54 @@ class TestHoneycombInterlocking:
         num_x = 3
         margin = 0.1  # 1mm
 
-        radius, centers, _ = hp._calculate_hex_layout(
+        radius, xs, ys, _ = _hex_layout(
             face_width, face_height, num_x, margin, flat_top=True
         )
 
-        sqrt3 = math.sqrt(3)
-        hex_height = sqrt3 * radius
-
-        # Get a hex from row 0 and the adjacent hex from row 1
-        first_row_y = centers[0][1]
-        row0_centers = sorted([c for c in centers if abs(c[1] - first_row_y) < 0.001], key=lambda c: c[0])
-
-        expected_row_spacing = (3 / 4) * hex_height + margin * sqrt3 / 2
-        second_row_y = first_row_y + expected_row_spacing
-        row1_centers = sorted([c for c in centers if abs(c[1] - second_row_y) < 0.01], key=lambda c: c[0])
-
-        if len(row0_centers) > 0 and len(row1_centers) > 0:
-            # Verify the row spacing
-            actual_spacing = row1_centers[0][1] - row0_centers[0][1]
-            assert abs(actual_spacing - expected_row_spacing) < 0.01
+        hex_height = SQRT3 * radius
+
+        expected_row_spacing = (3 / 4) * hex_height + margin * SQRT3 / 2
+
+        # Locate the row at the expected spacing with one bisect probe
+        row_ys, _ = _hex_rows(face_width, face_height, num_x, margin, flat_top=True)
+        row1_idx = _row_index_near(row_ys, row_ys[0] + expected_row_spacing)
+
+        if row1_idx is not None:
+            actual_spacing = row_ys[row1_idx] - row_ys[0]
+            assert actual_spacing == pytest.approx(expected_row_spacing, abs=0.01)
+
+
+class TestBuildHexVertices:
+    """Tests for _build_hex_vertices, the batched vertex-coordinate pass."""
+
+    def test_empty_centers(self):
+        verts_x, verts_y = hp._build_hex_vertices([], [], [(1, 0)] * 6)
+        assert verts_x == []
+        assert verts_y == []
+
+    def test_six_vertices_per_hex(self):
+        offsets = [(math.cos(i * math.pi / 3), math.sin(i * math.pi / 3)) for i in range(6)]
+        verts_x, verts_y = hp._build_hex_vertices([0.0, 5.0, 10.0], [0.0, 1.0, 2.0], offsets)
+        assert len(verts_x) == 18
+        assert len(verts_y) == 18
+
+    def test_vertices_offset_from_center(self):
+        """Each vertex should be center + offset, in offset order."""
+        offsets = [(1.0, 0.0), (0.5, 0.5), (-0.5, 0.5), (-1.0, 0.0), (-0.5, -0.5), (0.5, -0.5)]
+        cx, cy = 3.0, -2.0
+        verts_x, verts_y = hp._build_hex_vertices([cx], [cy], offsets)
+        for i, (dx, dy) in enumerate(offsets):
+            assert verts_x[i] == pytest.approx(cx + dx, abs=1e-12)
+            assert verts_y[i] == pytest.approx(cy + dy, abs=1e-12)
+
+    def test_unit_hex_vertices_on_circumcircle(self):
+        """With the module's unit offsets scaled by r, vertices lie on the circumcircle."""
+        radius = 0.7
+        offsets = [(radius * ux, radius * uy) for ux, uy in hp.UNIT_HEX_FLAT]
+        verts_x, verts_y = hp._build_hex_vertices([1.0], [2.0], offsets)
+        for vx, vy in zip(verts_x, verts_y):
+            dist = math.hypot(vx - 1.0, vy - 2.0)
+            assert dist == pytest.approx(radius, abs=1e-12)
 
 
 if __name__ == '__main__':
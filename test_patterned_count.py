@@ -5,19 +5,8 @@
 
 import math
 import pytest
-from unittest.mock import MagicMock, patch
-import sys
-
-# Mock the adsk module before importing PatternedCount
-adsk_mock = MagicMock()
-adsk_mock.core = MagicMock()
-adsk_mock.fusion = MagicMock()
-sys.modules['adsk'] = adsk_mock
-sys.modules['adsk.core'] = adsk_mock.core
-sys.modules['adsk.fusion'] = adsk_mock.fusion
-
-# Now we can import our module
-sys.path.insert(0, 'PatternedCount')
+
+# conftest.py stubs the adsk modules and sets up sys.path before this import
 import PatternedCount as pc
 
 
@@ -79,14 +68,14 @@ class TestCircularModeGeometry:
         """10 segments should give 36 degree (pi/5 radian) spacing."""
         seg_count = 10
         segment_angle = 2 * math.pi / seg_count
-        assert abs(segment_angle - math.pi / 5) < 0.0001
-        assert abs(math.degrees(segment_angle) - 36) < 0.01
+        assert segment_angle == pytest.approx(math.pi / 5, abs=0.0001)
+        assert math.degrees(segment_angle) == pytest.approx(36, abs=0.01)
 
     def test_segment_angle_12_segments(self):
         """12 segments should give 30 degree spacing."""
         seg_count = 12
         segment_angle = 2 * math.pi / seg_count
-        assert abs(math.degrees(segment_angle) - 30) < 0.01
+        assert math.degrees(segment_angle) == pytest.approx(30, abs=0.01)
 
     def test_position_on_circle(self):
         """Test calculating position on circle from angle."""
@@ -97,15 +86,15 @@ class TestCircularModeGeometry:
         angle = 0
         x = center_x + radius * math.cos(angle)
         y = center_y + radius * math.sin(angle)
-        assert abs(x - 7.0) < 0.0001
-        assert abs(y - 5.0) < 0.0001
+        assert x == pytest.approx(7.0, abs=0.0001)
+        assert y == pytest.approx(5.0, abs=0.0001)
 
         # At angle pi/2 (top of circle)
         angle = math.pi / 2
         x = center_x + radius * math.cos(angle)
         y = center_y + radius * math.sin(angle)
-        assert abs(x - 5.0) < 0.0001
-        assert abs(y - 7.0) < 0.0001
+        assert x == pytest.approx(5.0, abs=0.0001)
+        assert y == pytest.approx(7.0, abs=0.0001)
 
     def test_clockwise_vs_counterclockwise(self):
         """CW should negate the segment angle."""
@@ -155,29 +144,55 @@ class TestLinearModeGeometry:
             assert target_cy == i * 6.0
 
 
+class _Point:
+    __slots__ = ('x', 'y')
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class _BoundingBox:
+    __slots__ = ('minPoint', 'maxPoint')
+
+    def __init__(self, min_x, min_y, max_x, max_y):
+        self.minPoint = _Point(min_x, min_y)
+        self.maxPoint = _Point(max_x, max_y)
+
+
+class _SketchText:
+    __slots__ = ('text', 'boundingBox')
+
+    def __init__(self, text, bounding_box):
+        self.text = text
+        self.boundingBox = bounding_box
+
+
+class _SketchTexts:
+    """Minimal texts collection exposing the count/item pair the code reads."""
+    __slots__ = ('count', 'item')
+
+    def __init__(self, count, item):
+        self.count = count
+        self.item = item
+
+
+def make_mock_text(text_val, cx=0, cy=0):
+    """Build a plain-class text stub - no MagicMock attribute dispatch."""
+    return _SketchText(text_val, _BoundingBox(cx - 1, cy - 1, cx + 1, cy + 1))
+
+
 class TestCollectTextBoxes:
     """Tests for _collect_text_boxes function."""
 
     def test_rotation_angles_calculated(self):
         """Test that rotation angles are calculated correctly for circular mode."""
-        # Mock texts collection
-        mock_texts = MagicMock()
-        mock_texts.count = 3
-
-        def make_mock_text(text_val, cx, cy):
-            t = MagicMock()
-            t.text = text_val
-            t.boundingBox.minPoint.x = cx - 1
-            t.boundingBox.minPoint.y = cy - 1
-            t.boundingBox.maxPoint.x = cx + 1
-            t.boundingBox.maxPoint.y = cy + 1
-            return t
-
-        mock_texts.item = lambda i: [
+        items = [
             make_mock_text('0', 0, 0),
             make_mock_text('1', 5, 0),
             make_mock_text('2', 10, 0),
-        ][i]
+        ]
+        mock_texts = _SketchTexts(len(items), items.__getitem__)
 
         start_number = 0
         segment_angle = math.pi / 5  # 36 degrees
@@ -186,73 +201,63 @@ class TestCollectTextBoxes:
 
         assert len(result) == 3
         assert result[0]['rotation'] == 0  # Template, no rotation
-        assert abs(result[1]['rotation'] - segment_angle) < 0.0001
-        assert abs(result[2]['rotation'] - 2 * segment_angle) < 0.0001
+        assert result[1]['rotation'] == pytest.approx(segment_angle, abs=0.0001)
+        assert result[2]['rotation'] == pytest.approx(2 * segment_angle, abs=0.0001)
 
     def test_linear_mode_no_rotation(self):
         """In linear mode, all rotation angles should be 0."""
-        mock_texts = MagicMock()
-        mock_texts.count = 2
-
-        def make_mock_text(text_val):
-            t = MagicMock()
-            t.text = text_val
-            t.boundingBox.minPoint.x = 0
-            t.boundingBox.minPoint.y = 0
-            t.boundingBox.maxPoint.x = 1
-            t.boundingBox.maxPoint.y = 1
-            return t
-
-        mock_texts.item = lambda i: make_mock_text(str(i))
+        items = [_SketchText(str(i), _BoundingBox(0, 0, 1, 1)) for i in range(2)]
+        mock_texts = _SketchTexts(len(items), items.__getitem__)
 
         result = pc._collect_text_boxes(mock_texts, 0, False, 0)
 
         assert all(tb['rotation'] == 0 for tb in result)
 
 
+# Parametrize cases, hoisted so collection reuses one frozen tuple
+_DIR_CASES = (
+    ("+X", (1, 0)),
+    ("-X", (-1, 0)),
+    ("+Y", (0, 1)),
+    ("-Y", (0, -1)),
+    ("+x", (1, 0)),  # lowercase
+    ("-y", (0, -1)),
+    ("  +X  ", (1, 0)),  # whitespace
+)
+
+_ARC_CASES = (
+    ("CW", True),
+    ("CCW", False),
+    ("cw", True),
+    ("ccw", False),
+    ("  CW  ", True),
+    ("'CW'", True),
+    ('"CCW"', False),
+)
+
+
 class TestDirectionParsing:
     """Tests for direction parameter parsing logic."""
 
-    @pytest.mark.parametrize("dir_str,expected", [
-        ("+X", (1, 0)),
-        ("-X", (-1, 0)),
-        ("+Y", (0, 1)),
-        ("-Y", (0, -1)),
-        ("+x", (1, 0)),  # lowercase
-        ("-y", (0, -1)),
-        ("  +X  ", (1, 0)),  # whitespace
-    ])
+    @pytest.mark.parametrize("dir_str,expected", _DIR_CASES)
     def test_direction_parsing(self, dir_str, expected):
-        """Test various direction string formats."""
+        """Test various direction string formats against the lookup table."""
         dir_str_clean = dir_str.strip().strip("'\"").upper()
-        dir_x, dir_y = 1, 0  # default
-        if dir_str_clean == "-X":
-            dir_x, dir_y = -1, 0
-        elif dir_str_clean == "+Y":
-            dir_x, dir_y = 0, 1
-        elif dir_str_clean == "-Y":
-            dir_x, dir_y = 0, -1
+        assert pc._DIRECTIONS.get(dir_str_clean, (1, 0)) == expected
 
-        assert (dir_x, dir_y) == expected
+    def test_unknown_direction_defaults_to_plus_x(self):
+        """Unknown direction strings keep the documented +X default."""
+        assert pc._DIRECTIONS.get("SIDEWAYS", (1, 0)) == (1, 0)
 
 
 class TestArcDirectionParsing:
     """Tests for arc direction parameter parsing."""
 
-    @pytest.mark.parametrize("arc_str,expected_cw", [
-        ("CW", True),
-        ("CCW", False),
-        ("cw", True),
-        ("ccw", False),
-        ("  CW  ", True),
-        ("'CW'", True),
-        ('"CCW"', False),
-    ])
+    @pytest.mark.parametrize("arc_str,expected_cw", _ARC_CASES)
     def test_arc_direction_parsing(self, arc_str, expected_cw):
-        """Test various arc direction string formats."""
+        """Test various arc direction string formats against the lookup table."""
         arc_str_clean = arc_str.strip().strip("'\"").upper()
-        arc_clockwise = arc_str_clean == "CW"
-        assert arc_clockwise == expected_cw
+        assert pc._ARC_CLOCKWISE.get(arc_str_clean, False) == expected_cw
 
 
 if __name__ == '__main__':